@@ -7,9 +7,17 @@ from agents import (
 )
 from dotenv import load_dotenv
 
+from thinky._http import get_http_client
+from thinky._memoize import memoize_tool, tool_cache_stats
 from thinky.client import get_client
 
-from ._registry import agent_registry, get_agent, register_agent
+from ._registry import (
+    agent_cache_stats,
+    agent_registry,
+    get_agent,
+    invalidate_agent,
+    register_agent,
+)
 
 load_dotenv()
 set_tracing_disabled(True)
@@ -20,4 +28,13 @@ set_default_openai_api("chat_completions")
 
 __version__ = "0.0.1"
 
-__all__ = ["agent_registry", "get_agent", "register_agent"]
+__all__ = [
+    "agent_cache_stats",
+    "agent_registry",
+    "get_agent",
+    "get_http_client",
+    "invalidate_agent",
+    "memoize_tool",
+    "register_agent",
+    "tool_cache_stats",
+]
@@ -1,10 +1,9 @@
 # See https://modelcontextprotocol.io/quickstart/server for source of the tool.
 from typing import Any, Dict, Optional
 
-import httpx
 from agents import Agent, function_tool
 
-from thinky import register_agent
+from thinky import get_http_client, memoize_tool, register_agent
 
 # Constants
 NWS_API_BASE = "https://api.weather.gov"
@@ -14,16 +13,16 @@ USER_AGENT = "weather-app/1.0"
 async def make_nws_request(url: str) -> Optional[Dict[str, Any]]:
     """Make a request to the NWS API with proper error handling."""
     headers = {"User-Agent": USER_AGENT, "Accept": "application/geo+json"}
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, headers=headers, timeout=30.0)
-            response.raise_for_status()
-            return response.json()
-        except Exception:
-            return None
+    try:
+        response = await get_http_client().get(url, headers=headers, timeout=30.0)
+        response.raise_for_status()
+        return response.json()
+    except Exception:
+        return None
 
 
 @function_tool
+@memoize_tool(ttl=600)
 async def get_forecast(latitude: float, longitude: float) -> str:
     """Get weather forecast for a location.
 
@@ -60,7 +59,7 @@ Forecast: {period["detailedForecast"]}
     return "---".join(forecasts)
 
 
-@register_agent
+@register_agent(reuse=True)
 def weather_agent():
     return Agent(
         name="weather_agent",
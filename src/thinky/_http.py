@@ -0,0 +1,73 @@
+import importlib.util
+import logging
+from typing import Optional
+
+import httpx
+
+from thinky._settings import env_bool, env_float, env_int
+
+logger = logging.getLogger(__name__)
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _http2_enabled() -> bool:
+    """Use HTTP/2 when requested and the optional `h2` package is installed."""
+    if not env_bool("THINKY_HTTP2", True):
+        return False
+
+    if importlib.util.find_spec("h2") is None:
+        logger.debug("HTTP/2 disabled, install 'thinky[http2]' to enable it.")
+        return False
+    return True
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create a pooled HTTP client configured from the environment.
+
+    Settings:
+        THINKY_HTTP_MAX_CONNECTIONS: Maximum number of open connections (default 100).
+        THINKY_HTTP_MAX_KEEPALIVE_CONNECTIONS: Idle connections kept open (default 20).
+        THINKY_HTTP_KEEPALIVE_EXPIRY: Seconds an idle connection is kept (default 30).
+        THINKY_HTTP_TIMEOUT: Default request timeout in seconds (default 30).
+        THINKY_HTTP2: Negotiate HTTP/2 when `h2` is installed (default true).
+
+    Returns:
+        httpx.AsyncClient: A new client, the caller is responsible for closing it.
+    """
+    limits = httpx.Limits(
+        max_connections=env_int("THINKY_HTTP_MAX_CONNECTIONS", 100),
+        max_keepalive_connections=env_int("THINKY_HTTP_MAX_KEEPALIVE_CONNECTIONS", 20),
+        keepalive_expiry=env_float("THINKY_HTTP_KEEPALIVE_EXPIRY", 30.0),
+    )
+    timeout = httpx.Timeout(env_float("THINKY_HTTP_TIMEOUT", 30.0))
+
+    return httpx.AsyncClient(limits=limits, timeout=timeout, http2=_http2_enabled())
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the process wide pooled HTTP client.
+
+    Tools should use this client instead of opening a new `httpx.AsyncClient` per
+    call, so connections and TLS sessions are reused between requests. The client is
+    created on first use and must not be closed by callers.
+
+    Returns:
+        httpx.AsyncClient: The shared client.
+    """
+    global _http_client
+
+    if _http_client is None or _http_client.is_closed:
+        _http_client = create_http_client()
+        logger.debug("Created shared HTTP client")
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and its pooled connections."""
+    global _http_client
+
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+        logger.debug("Closed shared HTTP client")
+    _http_client = None
@@ -0,0 +1,118 @@
+import functools
+import inspect
+import json
+from typing import Any, Callable, Dict, Optional, TypeVar, Union, overload
+
+from agents import RunContextWrapper
+
+from thinky._cache import CacheStats, TTLCache
+from thinky._singleflight import SingleFlight
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+memoized_tools: Dict[str, Callable[..., Any]] = {}
+
+_MISSING = object()
+
+
+def _make_key(signature: inspect.Signature, args: Any, kwargs: Any) -> str:
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    arguments = {
+        name: value
+        for name, value in bound.arguments.items()
+        # The run context differs between calls and does not change the result.
+        if not isinstance(value, RunContextWrapper)
+    }
+    return json.dumps(arguments, sort_keys=True, default=repr)
+
+
+@overload
+def memoize_tool(func: F) -> F: ...
+
+
+@overload
+def memoize_tool(
+    func: None = None, *, ttl: Optional[float] = 300, maxsize: int = 256
+) -> Callable[[F], F]: ...
+
+
+def memoize_tool(
+    func: Optional[F] = None, *, ttl: Optional[float] = 300, maxsize: int = 256
+) -> Union[F, Callable[[F], F]]:
+    """
+    Decorator to memoize the results of an async tool by its arguments.
+
+    Concurrent calls with the same arguments share a single execution, and results
+    are cached for `ttl` seconds with least recently used eviction. Place it below
+    `function_tool`, the signature and docstring are preserved so the JSON schema of
+    the tool does not change:
+
+        @function_tool
+        @memoize_tool(ttl=600)
+        async def get_forecast(latitude: float, longitude: float) -> str: ...
+
+    Exceptions are never cached. The cache statistics of the decorated function are
+    available through its `cache_info()` attribute.
+
+    Args:
+        func (Callable): The async function to memoize.
+        ttl (Optional[float]): Seconds a result stays valid, `None` to never expire.
+        maxsize (int): Maximum number of cached argument combinations.
+
+    Returns:
+        Callable: The memoized function.
+
+    Raises:
+        TypeError: If the decorated function is not a coroutine function.
+    """
+
+    def decorator(func: F) -> F:
+        if not inspect.iscoroutinefunction(func):
+            raise TypeError(
+                f"memoize_tool only supports async functions, '{func.__name__}' is not."
+            )
+
+        signature = inspect.signature(func)
+        cache: TTLCache[Any] = TTLCache(maxsize=maxsize, ttl=ttl)
+        flight: SingleFlight[Any] = SingleFlight()
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = _make_key(signature, args, kwargs)
+            value = cache.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+
+            async def call() -> Any:
+                result = await func(*args, **kwargs)
+                cache.set(key, result)
+                return result
+
+            result, _ = await flight.do(key, call)
+            return result
+
+        def cache_info() -> CacheStats:
+            stats = cache.stats()
+            return CacheStats(
+                hits=stats.hits,
+                misses=stats.misses,
+                evictions=stats.evictions,
+                size=stats.size,
+                maxsize=stats.maxsize,
+                coalesced=flight.coalesced,
+            )
+
+        wrapper.cache_info = cache_info  # type: ignore
+        wrapper.cache_clear = cache.clear  # type: ignore
+        memoized_tools[func.__qualname__] = wrapper
+        return wrapper  # type: ignore
+
+    if func is None:
+        return decorator
+    return decorator(func)
+
+
+def tool_cache_stats() -> Dict[str, CacheStats]:
+    """Cache statistics of every memoized tool, keyed by function name."""
+    return {name: tool.cache_info() for name, tool in memoized_tools.items()}  # type: ignore
@@ -5,26 +5,83 @@ import pkgutil
 from dataclasses import dataclass
 from logging import getLogger
 from pathlib import Path
-from typing import Callable, Dict, Optional, Union
+from typing import Callable, Dict, Optional, Union, overload
 
 from agents import Agent
 
+from thinky._cache import CacheStats, TTLCache
+from thinky._settings import env_float, env_int
 from thinky.exceptions import AgentRegistrationException
 
-agent_registry: Dict[str, Callable[..., Agent]] = {}
+AgentFactory = Callable[..., Agent]
+
+agent_registry: Dict[str, AgentFactory] = {}
 
 logger = getLogger()
 
 
-def register_agent(func: Callable[..., Agent]) -> Callable[..., Agent]:  # type: ignore
+@dataclass(frozen=True)
+class AgentOptions:
+    """Options given to `register_agent` that control how thinky serves an agent.
+
+    Attributes:
+        reuse (bool): Build the agent once and share the instance between runs. Only
+            enable this for agents whose factory has no per-run side effects.
+        response_cache (bool): Allow final outputs of this agent to be served from the
+            response cache. Disable it for agents whose answers must always be fresh.
+    """
+
+    reuse: bool = False
+    response_cache: bool = True
+
+
+agent_options: Dict[str, AgentOptions] = {}
+
+agent_cache: TTLCache[Agent] = TTLCache(
+    maxsize=env_int("THINKY_AGENT_CACHE_SIZE", 128),
+    ttl=env_float("THINKY_AGENT_CACHE_TTL", None),
+)
+
+
+def _register(func: AgentFactory, options: AgentOptions) -> AgentFactory:
+    name: str = func.__name__  # type: ignore
+    if name in agent_registry:
+        message = f"Agent '{name}' is already registered."
+        logger.error(message)
+        raise AgentRegistrationException(message)
+
+    agent_registry[name] = func
+    agent_options[name] = options
+    # A previous factory with the same name may still have a cached instance.
+    agent_cache.pop(name)
+    logger.debug(f"Registerd agent '{name}'")
+    return func
+
+
+@overload
+def register_agent(func: AgentFactory) -> AgentFactory: ...
+
+
+@overload
+def register_agent(
+    func: None = None, *, reuse: bool = False, response_cache: bool = True
+) -> Callable[[AgentFactory], AgentFactory]: ...
+
+
+def register_agent(func=None, *, reuse=False, response_cache=True):  # type: ignore
     """
     Decorator to register an agent creation function in the global agent registry.
 
     The function name is used as the key in the registry. If a function with the same
-    name is already registered, an AgentRegistrationException is raised.
+    name is already registered, an AgentRegistrationException is raised. The decorator
+    can be used bare (`@register_agent`) or with options (`@register_agent(reuse=True)`).
 
     Args:
         func (Callable[..., Agent]): A callable that returns an instance of Agent.
+        reuse (bool): Cache the agent instance and share it between runs instead of
+            calling the factory on every lookup.
+        response_cache (bool): Allow runs of this agent to be served from the response
+            cache when one is configured.
 
     Returns:
         Callable[..., Agent]: The original function, unmodified.
@@ -32,15 +89,27 @@ def register_agent(func: Callable[..., Agent]) -> Callable[..., Agent]:  # type:
     Raises:
         AgentRegistrationException: If an agent with the same name is already registered.
     """
-    name: str = func.__name__  # type: ignore
-    if name in agent_registry:
-        message = f"Agent '{name}' is already registered."
-        logger.error(message)
-        raise AgentRegistrationException(message)
+    options = AgentOptions(reuse=reuse, response_cache=response_cache)
+
+    if func is None:
+        return lambda f: _register(f, options)
+
+    return _register(func, options)
 
-    agent_registry[name] = func
-    logger.debug(f"Registerd agent '{name}'")
-    return func
+
+def get_agent_options(agent_id: str) -> AgentOptions:
+    """Get the registration options of an agent, defaults if it has none."""
+    return agent_options.get(agent_id, AgentOptions())
+
+
+def ensure_registered(agent_id: str) -> None:
+    """Check that an agent is registered without building it.
+
+    Raises:
+        AgentRegistrationException: If no agent registered under the given `agent_id`.
+    """
+    if agent_id not in agent_registry:
+        raise AgentRegistrationException(f"Agent '{agent_id}' is not registered.")
 
 
 def get_agent(agent_id: str) -> Agent:
@@ -49,6 +118,8 @@ def get_agent(agent_id: str) -> Agent:
 
     Looks up the given `agent_id` in the global `agent_registry`, retrieves the
     corresponding agent creation function, and returns a new instance of the agent.
+    Agents registered with `reuse=True` are served from `agent_cache` and the factory
+    only runs on a cache miss.
 
     Args:
         agent_id (str): The unique identifier (defaults to function name) of the registed agent.
@@ -59,12 +130,32 @@ def get_agent(agent_id: str) -> Agent:
     Raises:
         AgentRegistrationException: If no agent registered under the given `agent_id`.
     """
-    if agent_id not in agent_registry:
-        raise AgentRegistrationException(f"Agent '{agent_id}' is not registered.")
+    ensure_registered(agent_id)
 
     agent_callable = agent_registry[agent_id]
     logger.debug(f"Get agent '{agent_id}'")
-    return agent_callable()
+
+    if not get_agent_options(agent_id).reuse:
+        return agent_callable()
+
+    return agent_cache.get_or_set(agent_id, agent_callable)
+
+
+def invalidate_agent(agent_id: Optional[str] = None) -> None:
+    """Drop cached agent instances so the next lookup rebuilds them.
+
+    Args:
+        agent_id (Optional[str]): The agent to invalidate. Invalidates all agents if None.
+    """
+    if agent_id is None:
+        agent_cache.clear()
+    else:
+        agent_cache.pop(agent_id)
+
+
+def agent_cache_stats() -> CacheStats:
+    """Hit, miss and eviction counters of the agent instance cache."""
+    return agent_cache.stats()
 
 
 def get_agent_path(path: Optional[Path] = None) -> Path:
@@ -0,0 +1,302 @@
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Union
+
+from agents import Agent, TResponseInputItem
+
+from thinky._cache import CacheStats, TTLCache
+from thinky._settings import env_float, env_int, env_str
+
+logger = logging.getLogger(__name__)
+
+RunInput = Union[str, List[TResponseInputItem]]
+
+
+@dataclass
+class CachedRunResult:
+    """A run result served from the response cache instead of the model.
+
+    Mirrors the parts of `agents.RunResult` that thinky uses, so callers can treat
+    both the same way.
+    """
+
+    input: RunInput
+    final_output: Any
+    steps: List[Dict[str, Any]] = field(default_factory=list)
+    cached: bool = True
+
+    def to_input_list(self) -> List[Dict[str, Any]]:
+        return list(self.steps)
+
+
+def is_cached_result(result: Any) -> bool:
+    """Whether a run result was served from the response cache."""
+    return isinstance(result, CachedRunResult)
+
+
+def _digest(value: Any) -> str:
+    payload = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _model_fingerprint(agent: Agent) -> Dict[str, Any]:
+    model = agent.model
+    if model is not None and not isinstance(model, str):
+        model = f"{type(model).__qualname__}:{getattr(model, 'model', '')}"
+    return {"model": model, "settings": agent.model_settings.to_json_dict()}
+
+
+def _tools_fingerprint(agent: Agent) -> List[Dict[str, Any]]:
+    tools = [
+        {
+            "name": tool.name,
+            "description": getattr(tool, "description", None),
+            "schema": getattr(tool, "params_json_schema", None),
+        }
+        for tool in agent.tools
+    ]
+    handoffs = [getattr(handoff, "name", None) for handoff in agent.handoffs]
+    return sorted(tools, key=lambda tool: tool["name"]) + [{"handoffs": handoffs}]
+
+
+def _normalize_input(input: RunInput) -> RunInput:
+    if isinstance(input, str):
+        # Differences in whitespace do not change the prompt.
+        return " ".join(input.split())
+    return input
+
+
+def response_cache_key(agent_id: str, agent: Agent, input: RunInput) -> Optional[str]:
+    """Build the cache key of a run, or None when the run cannot be cached.
+
+    The key covers the agent id, the model and its settings, a hash of the
+    instructions, a hash of the tool set and the (whitespace normalized) input.
+    Agents with dynamic (callable) instructions are never cached.
+    """
+    if not isinstance(agent.instructions, (str, type(None))):
+        return None
+
+    return _digest(
+        {
+            "agent_id": agent_id,
+            "model": _model_fingerprint(agent),
+            "instructions": _digest(agent.instructions),
+            "tools": _digest(_tools_fingerprint(agent)),
+            "input": _normalize_input(input),
+        }
+    )
+
+
+class ResponseCacheBackend(ABC):
+    """Storage of cached run results, keyed by `response_cache_key`."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def set(self, key: str, value: Dict[str, Any]) -> None: ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+    @abstractmethod
+    def stats(self) -> CacheStats: ...
+
+
+class InMemoryBackend(ResponseCacheBackend):
+    """Process local LRU backend with a time-to-live."""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 3600) -> None:
+        self._cache: TTLCache[Dict[str, Any]] = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        self._cache.set(key, value)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> CacheStats:
+        return self._cache.stats()
+
+
+class SQLiteBackend(ResponseCacheBackend):
+    """SQLite file backend, shared between processes and kept across restarts.
+
+    Entries expire after `ttl` seconds and the least recently used entries are
+    removed once the table holds more than `maxsize` rows.
+    """
+
+    def __init__(
+        self,
+        path: str = "./thinky_cache.db",
+        maxsize: int = 1024,
+        ttl: Optional[float] = 3600,
+    ) -> None:
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_response_cache_accessed_at "
+                "ON response_cache (accessed_at)"
+            )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT value, stored_at FROM response_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is not None and self.ttl is not None and now - row[1] >= self.ttl:
+                self._connection.execute(
+                    "DELETE FROM response_cache WHERE key = ?", (key,)
+                )
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._connection.execute(
+                "UPDATE response_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self.hits += 1
+            return json.loads(row[0])
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO response_cache VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, default=str), now, now),
+            )
+            evicted = self._connection.execute(
+                "DELETE FROM response_cache WHERE key IN ("
+                "SELECT key FROM response_cache ORDER BY accessed_at DESC "
+                "LIMIT -1 OFFSET ?)",
+                (self.maxsize,),
+            ).rowcount
+            self.evictions += max(evicted, 0)
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM response_cache")
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            (size,) = self._connection.execute(
+                "SELECT COUNT(*) FROM response_cache"
+            ).fetchone()
+        return CacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            size=size,
+            maxsize=self.maxsize,
+        )
+
+
+class ResponseCache:
+    """Exact-match cache of final agent outputs in front of `run_agent`.
+
+    Only runs with a JSON serializable final output are stored. Backend calls run
+    on a worker thread, so a SQLite backend does not block the event loop.
+
+    Args:
+        backend (ResponseCacheBackend): Where cached results are stored.
+    """
+
+    def __init__(self, backend: ResponseCacheBackend) -> None:
+        self.backend = backend
+
+    async def get(self, key: str, input: RunInput) -> Optional[CachedRunResult]:
+        value = await asyncio.to_thread(self.backend.get, key)
+        if value is None:
+            return None
+        return CachedRunResult(
+            input=input, final_output=value["final_output"], steps=value["steps"]
+        )
+
+    async def set(self, key: str, result: Any) -> None:
+        final_output = result.final_output
+        if not isinstance(final_output, (str, int, float, bool, type(None))):
+            return
+
+        value = {"final_output": final_output, "steps": result.to_input_list()}
+        try:
+            await asyncio.to_thread(self.backend.set, key, value)
+        except Exception as e:
+            logger.warning(f"Failed to store response in cache: {e}")
+
+    def stats(self) -> CacheStats:
+        return self.backend.stats()
+
+
+_response_cache: Optional[ResponseCache] = None
+_configured = False
+
+
+def _cache_from_env() -> Optional[ResponseCache]:
+    kind = env_str("THINKY_RESPONSE_CACHE")
+    if kind is None or kind.lower() in ("0", "off", "false", "none"):
+        return None
+
+    maxsize = env_int("THINKY_RESPONSE_CACHE_SIZE", 1024)
+    ttl = env_float("THINKY_RESPONSE_CACHE_TTL", 3600)
+
+    if kind == "memory":
+        return ResponseCache(InMemoryBackend(maxsize=maxsize, ttl=ttl))
+
+    if kind == "sqlite":
+        path = env_str("THINKY_RESPONSE_CACHE_PATH", "./thinky_cache.db")
+        return ResponseCache(SQLiteBackend(path, maxsize=maxsize, ttl=ttl))  # type: ignore
+
+    raise ValueError(
+        f"'{kind}' is not a valid THINKY_RESPONSE_CACHE. Choose 'memory' or 'sqlite'."
+    )
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Get the response cache configured by `THINKY_RESPONSE_CACHE`, None if disabled.
+
+    Settings:
+        THINKY_RESPONSE_CACHE: `memory` or `sqlite`. Disabled when unset.
+        THINKY_RESPONSE_CACHE_SIZE: Maximum number of cached responses (default 1024).
+        THINKY_RESPONSE_CACHE_TTL: Seconds a response stays valid (default 3600).
+        THINKY_RESPONSE_CACHE_PATH: File of the sqlite backend (default ./thinky_cache.db).
+    """
+    global _response_cache, _configured
+
+    if not _configured:
+        _response_cache = _cache_from_env()
+        _configured = True
+    return _response_cache
+
+
+def set_response_cache(cache: Optional[ResponseCache]) -> None:
+    """Replace the response cache, None disables caching."""
+    global _response_cache, _configured
+
+    _response_cache = cache
+    _configured = True
@@ -1,13 +1,38 @@
-from agents import Runner, RunResult
+import asyncio
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional, Sequence, Union
 
-from thinky._registry import get_agent
+from agents import Runner, RunResult, RunResultStreaming
 
+from thinky._registry import ensure_registered, get_agent, get_agent_options
+from thinky._response_cache import (
+    CachedRunResult,
+    get_response_cache,
+    response_cache_key,
+)
+from thinky._settings import env_int
 
-async def run_agent(agent_id: str, input: str) -> RunResult:
+DEFAULT_BATCH_CONCURRENCY = env_int("THINKY_BATCH_CONCURRENCY", 8)
+
+
+@dataclass
+class BatchItemResult:
+    """Outcome of a single input of a batch run, either `result` or `error` is set."""
+
+    index: int
+    input: str
+    result: Optional[Union[RunResult, CachedRunResult]] = None
+    error: Optional[Exception] = None
+
+
+async def run_agent(agent_id: str, input: str) -> Union[RunResult, CachedRunResult]:
     """
     Run a workflow starting at the given agent. The agent will run in a loop until a final
     output is generated.
 
+    When a response cache is configured and the agent did not opt out, an identical
+    earlier run is returned as a `CachedRunResult` without calling the model.
+
     Args:
         input (str): The initial input to the agent. You can pass a single string for a user message,
         agent_id (str): The agent id (name).
@@ -17,5 +42,87 @@ async def run_agent(agent_id: str, input: str) -> RunResult:
         agent. Agents may perform handoffs, so we don't know the specific type of the output.
     """
     agent = get_agent(agent_id=agent_id)
+
+    cache = get_response_cache()
+    key = None
+    if cache is not None and get_agent_options(agent_id).response_cache:
+        key = response_cache_key(agent_id, agent, input)
+
+    if key is not None:
+        cached = await cache.get(key, input)  # type: ignore
+        if cached is not None:
+            return cached
+
     response = await Runner.run(agent, input=input)
+
+    if key is not None:
+        await cache.set(key, response)  # type: ignore
     return response
+
+
+def run_agent_streamed(agent_id: str, input: str) -> RunResultStreaming:
+    """
+    Run a workflow starting at the given agent in streaming mode.
+
+    The run starts in the background. Iterate over `stream_events()` of the returned
+    result to receive token deltas, tool calls and handoffs as they happen.
+
+    Args:
+        input (str): The initial input to the agent.
+        agent_id (str): The agent id (name).
+
+    Returns:
+        RunResultStreaming: A result that is filled in while the run progresses.
+
+    Raises:
+        AgentRegistrationException: If no agent registered under the given `agent_id`.
+    """
+    agent = get_agent(agent_id=agent_id)
+    return Runner.run_streamed(agent, input=input)
+
+
+async def run_agent_batch(
+    agent_id: str,
+    inputs: Sequence[str],
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+) -> AsyncIterator[BatchItemResult]:
+    """
+    Run an agent over many inputs with at most `concurrency` runs in flight.
+
+    Results are yielded as soon as each run finishes, so they are not in input order.
+    A failing input does not stop the batch, its exception is returned in the item.
+
+    Args:
+        agent_id (str): The agent id (name).
+        inputs (Sequence[str]): The initial inputs, one run per input.
+        concurrency (int): Maximum number of concurrent runs.
+
+    Yields:
+        BatchItemResult: The result or error of each input.
+
+    Raises:
+        AgentRegistrationException: If no agent registered under the given `agent_id`.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1.")
+
+    # Fail fast on unknown agents instead of returning the same error per input.
+    ensure_registered(agent_id)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(index: int, input: str) -> BatchItemResult:
+        async with semaphore:
+            try:
+                result = await run_agent(agent_id=agent_id, input=input)
+                return BatchItemResult(index=index, input=input, result=result)
+            except Exception as e:
+                return BatchItemResult(index=index, input=input, error=e)
+
+    tasks = [asyncio.ensure_future(run_one(i, x)) for i, x in enumerate(inputs)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
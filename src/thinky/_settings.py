@@ -0,0 +1,58 @@
+import os
+from typing import Optional
+
+
+def env_str(name: str, default: Optional[str] = None) -> Optional[str]:
+    """Read a string setting from the environment.
+
+    Args:
+        name (str): Name of the environment variable.
+        default (Optional[str]): Value returned when the variable is unset or empty.
+
+    Returns:
+        Optional[str]: The value of the environment variable or the default.
+    """
+    value = os.environ.get(name)
+    return value if value else default
+
+
+def env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment.
+
+    Raises:
+        ValueError: If the variable is set but is not a valid integer.
+    """
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(
+            f"Environment variable {name} must be an integer, got '{value}'."
+        )
+
+
+def env_float(name: str, default: Optional[float]) -> Optional[float]:
+    """Read a float setting from the environment.
+
+    Raises:
+        ValueError: If the variable is set but is not a valid number.
+    """
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(
+            f"Environment variable {name} must be a number, got '{value}'."
+        )
+
+
+def env_bool(name: str, default: bool) -> bool:
+    """Read a boolean setting from the environment (`1`, `true`, `yes` and `on` are truthy)."""
+    value = os.environ.get(name)
+    if not value:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
@@ -0,0 +1,45 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Coalesce concurrent calls with the same key into one execution.
+
+    The first caller for a key starts the call, callers arriving while it is in
+    flight wait for the same result (or exception). Once the call finishes the key
+    is released, so later callers start a new execution.
+
+    The shared call runs in its own task, cancelling one waiting caller does not
+    cancel the execution the other callers are waiting for.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, "asyncio.Future[T]"] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """Run `fn` unless a call with the same key is already in flight.
+
+        Returns:
+            Tuple[T, bool]: The result and whether it was shared with an earlier caller.
+        """
+        call = self._calls.get(key)
+        if call is not None and call.get_loop() is asyncio.get_running_loop():
+            self.coalesced += 1
+            return await asyncio.shield(call), True
+
+        call = asyncio.ensure_future(fn())
+        self._calls[key] = call
+        self.executions += 1
+        call.add_done_callback(lambda _: self._release(key, call))
+        return await asyncio.shield(call), False
+
+    def _release(self, key: Hashable, call: "asyncio.Future[T]") -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
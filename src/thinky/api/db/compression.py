@@ -0,0 +1,43 @@
+import importlib.util
+import zlib
+from typing import Tuple
+
+from thinky._settings import env_int
+
+# Payloads smaller than this are stored as is, compressing them saves little.
+COMPRESSION_THRESHOLD = env_int("THINKY_STEP_COMPRESSION_THRESHOLD", 1024)
+
+_zstd = None
+if importlib.util.find_spec("zstandard") is not None:
+    import zstandard as _zstd  # type: ignore
+
+
+def compress(data: bytes) -> Tuple[bytes, str]:
+    """Compress a payload with zstd when available, zlib otherwise.
+
+    Returns:
+        Tuple[bytes, str]: The stored bytes and their encoding (`raw`, `zstd` or `zlib`).
+    """
+    if len(data) < COMPRESSION_THRESHOLD:
+        return data, "raw"
+
+    if _zstd is not None:
+        return _zstd.ZstdCompressor(level=3).compress(data), "zstd"
+    return zlib.compress(data, 6), "zlib"
+
+
+def decompress(data: bytes, encoding: str) -> bytes:
+    """Reverse `compress`.
+
+    Raises:
+        ValueError: If the encoding is unknown or `zstandard` is needed but missing.
+    """
+    if encoding == "raw":
+        return data
+    if encoding == "zlib":
+        return zlib.decompress(data)
+    if encoding == "zstd":
+        if _zstd is None:
+            raise ValueError("Install 'thinky[zstd]' to read zstd compressed steps.")
+        return _zstd.ZstdDecompressor().decompress(data)
+    raise ValueError(f"Unknown step encoding '{encoding}'.")
@@ -0,0 +1,55 @@
+import json
+import logging
+import uuid
+
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from .models import AgentRun
+
+logger = logging.getLogger(__name__)
+
+
+def migrate_legacy_steps(connection: Connection, batch_size: int = 500) -> int:
+    """Move JSON string steps of older databases into the `agent_run_steps` table.
+
+    Runs are converted in batches, each in its own transaction, so an interrupted
+    migration continues where it stopped on the next start. Runs without a `run_id`
+    get one assigned.
+
+    Args:
+        connection (Connection): A connection to the database to migrate.
+        batch_size (int): Number of runs converted per transaction.
+
+    Returns:
+        int: The number of migrated runs.
+    """
+    migrated = 0
+    while True:
+        with Session(bind=connection) as db:
+            runs = (
+                db.query(AgentRun)
+                .filter(AgentRun.legacy_steps.isnot(None))
+                .order_by(AgentRun.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not runs:
+                break
+
+            for run in runs:
+                try:
+                    run.steps = json.loads(run.legacy_steps)  # type: ignore
+                except ValueError:
+                    logger.warning(f"Run {run.id} has unreadable steps, dropping them.")
+                    run.steps = []
+                run.legacy_steps = None  # type: ignore
+                if run.run_id is None:
+                    run.run_id = uuid.uuid4().hex  # type: ignore
+            db.flush()
+        connection.commit()
+        migrated += len(runs)
+
+    if migrated:
+        logger.info(f"Migrated steps of {migrated} run(s) to 'agent_run_steps'")
+    return migrated
@@ -1,15 +1,108 @@
-from sqlalchemy import Column, Integer, String
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, List
 
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+)
+from sqlalchemy.orm import relationship
+
+from .compression import compress, decompress
 from .session import Base
 
 
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class AgentRunStep(Base):
+    """A single input or output item of an agent run.
+
+    The typed columns describe the item for querying, the full item is stored as
+    JSON in `payload`, compressed when it is large.
+    """
+
+    __tablename__ = "agent_run_steps"
+    __table_args__ = (
+        Index("ix_agent_run_steps_agent_run_id_position", "agent_run_id", "position"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    agent_run_id = Column(
+        Integer, ForeignKey("agent_runs.id", ondelete="CASCADE"), nullable=False
+    )
+    position = Column(Integer, nullable=False)
+    type = Column(String)
+    role = Column(String)
+    name = Column(String)
+    call_id = Column(String, index=True)
+    size = Column(Integer)
+    encoding = Column(String, nullable=False)
+    payload = Column(LargeBinary, nullable=False)
+
+    @classmethod
+    def from_item(cls, position: int, item: Dict[str, Any]) -> "AgentRunStep":
+        data = json.dumps(item, default=str).encode("utf-8")
+        payload, encoding = compress(data)
+        return cls(
+            position=position,
+            type=item.get("type", "message" if "role" in item else None),
+            role=item.get("role"),
+            name=item.get("name"),
+            call_id=item.get("call_id"),
+            size=len(data),
+            encoding=encoding,
+            payload=payload,
+        )
+
+    def to_item(self) -> Dict[str, Any]:
+        return json.loads(decompress(self.payload, self.encoding))  # type: ignore
+
+
 class AgentRun(Base):
     __tablename__ = "agent_runs"
+    __table_args__ = (
+        # Composite indexes serve filtered keyset pagination (`WHERE x = ? AND id < ?`).
+        Index("ix_agent_runs_agent_id_id", "agent_id", "id"),
+        Index("ix_agent_runs_session_id_id", "session_id", "id"),
+        Index("ix_agent_runs_user_id_id", "user_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(String, unique=True, index=True)
     agent_id = Column(String, index=True)
     session_id = Column(String, index=True)
     user_id = Column(String, index=True)
     message = Column(String)
     response = Column(String)
-    steps = Column(String)
+    # JSON string steps of databases created before the `agent_run_steps` table,
+    # moved to `step_rows` by `migrate_legacy_steps`.
+    legacy_steps = Column("steps", String)
+    cached = Column(Boolean, default=False)
+    created_at = Column(DateTime(timezone=True), default=_utcnow, index=True)
+
+    # Steps are only loaded from the database when they are accessed.
+    step_rows = relationship(
+        AgentRunStep,
+        order_by=AgentRunStep.position,
+        cascade="all, delete-orphan",
+        lazy="select",
+    )
+
+    @property
+    def steps(self) -> List[Dict[str, Any]]:
+        return [step.to_item() for step in self.step_rows]
+
+    @steps.setter
+    def steps(self, items: List[Dict[str, Any]]) -> None:
+        self.step_rows = [
+            AgentRunStep.from_item(position, item)
+            for position, item in enumerate(items)
+        ]
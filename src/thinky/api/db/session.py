@@ -1,35 +1,165 @@
-from typing import Generator
+import logging
+from typing import Any, AsyncGenerator, Dict
 
-from sqlalchemy.engine import Engine, create_engine
-from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import Connection, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import StaticPool
+
+from thinky._settings import env_bool, env_int, env_str
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATABASE_URL = "sqlite:///./thinky.db"
+
+# Async drivers used for URLs that name a database without a driver.
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg", "postgres": "asyncpg"}
+
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": "5000",
+    "foreign_keys": "ON",
+    "cache_size": "-20000",
+    "temp_store": "MEMORY",
+}
+
+Base = declarative_base()
+
+
+def to_async_url(url: str) -> str:
+    """Add the async driver to a database URL that does not name one.
+
+    `sqlite:///./thinky.db` becomes `sqlite+aiosqlite:///./thinky.db` and
+    `postgresql://...` becomes `postgresql+asyncpg://...`.
+    """
+    parsed = make_url(url)
+    if "+" in parsed.drivername:
+        return url
+
+    driver = ASYNC_DRIVERS.get(parsed.drivername)
+    if driver is None:
+        raise ValueError(
+            f"No async driver known for '{parsed.drivername}', "
+            "set THINKY_DATABASE_URL with an explicit driver (dialect+driver://)."
+        )
+    return parsed.set(
+        drivername=f"{parsed.get_backend_name()}+{driver}"
+    ).render_as_string(hide_password=False)
+
+
+def _set_sqlite_pragmas(dbapi_connection: Any, _: Any) -> None:
+    cursor = dbapi_connection.cursor()
+    for pragma, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {pragma}={value}")
+    cursor.close()
+
+
+def create_db_engine(url: str, **kwargs: Any) -> AsyncEngine:
+    """Create an async engine with thinky's pool and SQLite settings.
+
+    Settings:
+        THINKY_DATABASE_POOL_SIZE: Connections kept in the pool (default 5).
+        THINKY_DATABASE_MAX_OVERFLOW: Extra connections under load (default 10).
+        THINKY_DATABASE_POOL_RECYCLE: Seconds before a connection is replaced (default 1800).
+        THINKY_DATABASE_POOL_TIMEOUT: Seconds to wait for a free connection (default 30).
+        THINKY_SQLITE_WAL: Enable WAL mode and tuned pragmas on SQLite (default true).
 
-engine: Engine = create_engine(
-    "sqlite:///./thinky.db", connect_args={"check_same_thread": False}
+    Args:
+        url (str): Database URL, with or without an async driver.
+        **kwargs: Overrides passed to `create_async_engine`, e.g. `poolclass`.
+
+    Returns:
+        AsyncEngine: The configured engine.
+    """
+    async_url = to_async_url(url)
+    parsed = make_url(async_url)
+    is_sqlite = parsed.get_backend_name() == "sqlite"
+
+    options: Dict[str, Any] = {"pool_pre_ping": True}
+    if is_sqlite and parsed.database in (None, "", ":memory:"):
+        options["poolclass"] = StaticPool
+    else:
+        options.update(
+            pool_size=env_int("THINKY_DATABASE_POOL_SIZE", 5),
+            max_overflow=env_int("THINKY_DATABASE_MAX_OVERFLOW", 10),
+            pool_recycle=env_int("THINKY_DATABASE_POOL_RECYCLE", 1800),
+            pool_timeout=env_int("THINKY_DATABASE_POOL_TIMEOUT", 30),
+        )
+    options.update(kwargs)
+    if "poolclass" in kwargs:
+        for option in ("pool_size", "max_overflow", "pool_timeout"):
+            options.pop(option, None)
+
+    engine = create_async_engine(async_url, **options)
+
+    if is_sqlite and env_bool("THINKY_SQLITE_WAL", True):
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+
+    return engine
+
+
+engine: AsyncEngine = create_db_engine(
+    env_str("THINKY_DATABASE_URL", DEFAULT_DATABASE_URL)  # type: ignore
 )
 
-SessionLocal: sessionmaker[Session] = sessionmaker(
-    autocommit=False, autoflush=False, bind=engine
+SessionLocal: async_sessionmaker[AsyncSession] = async_sessionmaker(
+    bind=engine, autoflush=False, expire_on_commit=False
 )
 
-Base = declarative_base()
 
+def _add_missing_columns(connection: Connection) -> None:
+    """Add columns and indexes introduced after a table was first created.
+
+    `create_all` only creates missing tables, so databases created by an older
+    version of thinky are upgraded in place with `ALTER TABLE ... ADD COLUMN`.
+    """
+    inspector = inspect(connection)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=connection.dialect)
+            connection.execute(
+                text(
+                    f'ALTER TABLE "{table.name}" '
+                    f'ADD COLUMN "{column.name}" {column_type}'
+                )
+            )
+            logger.info(f"Added column '{column.name}' to '{table.name}'")
+
+        for index in table.indexes:
+            index.create(bind=connection, checkfirst=True)
 
-def init_db() -> None:
-    """Initialize the database."""
-    Base.metadata.create_all(bind=engine)
 
+async def init_db(bind: AsyncEngine = engine) -> None:
+    """Initialize the database and upgrade databases created by older versions."""
+    from .migrations import migrate_legacy_steps
 
-def get_db() -> Generator[Session, None, None]:
+    async with bind.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.run_sync(_add_missing_columns)
+
+    async with bind.connect() as connection:
+        await connection.run_sync(migrate_legacy_steps)
+        await connection.commit()
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency to get a database session.
 
     Yields:
-        Session: A SQLAlchemy database session.
+        AsyncSession: A SQLAlchemy async database session.
     """
-    db: Session = SessionLocal()
-
-    try:
+    async with SessionLocal() as db:
         yield db
-    # except Exception:
-    #     db.rollback()
-    finally:
-        db.close()
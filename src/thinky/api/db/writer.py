@@ -0,0 +1,182 @@
+import asyncio
+import logging
+from typing import Callable, List, Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from thinky._settings import env_float, env_int
+
+from .models import AgentRun
+from .session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class TraceWriter:
+    """Write-behind queue that persists `AgentRun` rows off the request path.
+
+    Rows are buffered in a bounded queue and written by a background task in bulk
+    transactions, so request handlers never wait for a database commit. A batch is
+    flushed once it holds `max_batch_size` rows or when `flush_interval` seconds
+    passed since its first row. When the queue is full `submit` waits for room,
+    which applies backpressure to the producers.
+
+    Args:
+        session_factory (Callable[[], AsyncSession]): Creates the sessions used for writing.
+        max_batch_size (int): Number of rows that triggers a flush.
+        flush_interval (float): Maximum seconds a row waits in the buffer.
+        max_queue_size (int): Number of pending submissions before `submit` blocks.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = SessionLocal,
+        max_batch_size: int = 100,
+        flush_interval: float = 0.5,
+        max_queue_size: int = 1000,
+    ) -> None:
+        self.session_factory = session_factory
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+
+        self.rows_written = 0
+        self.rows_failed = 0
+        self.batches_written = 0
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of submissions waiting to be written."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self) -> None:
+        """Start the background writer on the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self.running and self._loop is loop:
+            return
+
+        leftovers = self._drain_abandoned_queue()
+        if leftovers:
+            # A previous event loop stopped with rows still buffered.
+            await self._write(leftovers)
+
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._task = loop.create_task(self._worker(), name="thinky-trace-writer")
+
+    async def submit(self, *runs: AgentRun) -> None:
+        """Queue rows for writing. Rows submitted together share one transaction.
+
+        Waits when the queue is full until the writer has caught up.
+        """
+        if not runs:
+            return
+
+        if not self.running or self._loop is not asyncio.get_running_loop():
+            await self.start()
+
+        await self._queue.put(list(runs))  # type: ignore
+
+    async def flush(self) -> None:
+        """Wait until every row submitted so far has been written."""
+        if self.running:
+            await self._queue.join()  # type: ignore
+
+    async def close(self) -> None:
+        """Write all buffered rows and stop the background writer."""
+        if not self.running:
+            return
+
+        await self._queue.put(_STOP)  # type: ignore
+        await self._task  # type: ignore
+        self._task = None
+        self._queue = None
+
+    async def _worker(self) -> None:
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        stopping = False
+
+        while not stopping:
+            item = await queue.get()  # type: ignore
+            if item is _STOP:
+                queue.task_done()  # type: ignore
+                break
+
+            groups: List[List[AgentRun]] = [item]
+            rows = len(item)
+            deadline = loop.time() + self.flush_interval
+
+            while rows < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout)  # type: ignore
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    queue.task_done()  # type: ignore
+                    stopping = True
+                    break
+                groups.append(item)
+                rows += len(item)
+
+            await self._write(groups)
+            for _ in groups:
+                queue.task_done()  # type: ignore
+
+    async def _write(self, groups: Sequence[List[AgentRun]]) -> None:
+        rows = [row for group in groups for row in group]
+        try:
+            await self._commit(rows)
+            self.batches_written += 1
+            self.rows_written += len(rows)
+            return
+        except Exception as e:
+            if len(groups) == 1:
+                self.rows_failed += len(rows)
+                logger.error(f"Failed to write {len(rows)} trace(s): {e}")
+                return
+            logger.warning(f"Batch write failed, retrying per submission: {e}")
+
+        # Retry each submission on its own so one bad row does not drop the batch.
+        for group in groups:
+            await self._write([group])
+
+    async def _commit(self, rows: List[AgentRun]) -> None:
+        async with self.session_factory() as db:
+            try:
+                db.add_all(rows)
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+
+    def _drain_abandoned_queue(self) -> List[List[AgentRun]]:
+        leftovers: List[List[AgentRun]] = []
+        if self._queue is None:
+            return leftovers
+
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not _STOP:
+                leftovers.append(item)
+        return leftovers
+
+
+trace_writer = TraceWriter(
+    max_batch_size=env_int("THINKY_TRACE_BATCH_SIZE", 100),
+    flush_interval=env_float("THINKY_TRACE_FLUSH_INTERVAL", 0.5),  # type: ignore
+    max_queue_size=env_int("THINKY_TRACE_QUEUE_SIZE", 1000),
+)
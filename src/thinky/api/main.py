@@ -1,9 +1,13 @@
 from contextlib import asynccontextmanager
 
+from agents import set_default_openai_client
 from fastapi import FastAPI
 
+from thinky._http import close_http_client, get_http_client
 from thinky._registry import get_agent_imports
+from thinky.client import get_client
 from thinky.api.db.session import init_db
+from thinky.api.db.writer import trace_writer
 
 from .routes.v1 import v1_router
 
@@ -11,9 +15,15 @@ from .routes.v1 import v1_router
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     """Logic that needs to run before application start up."""
-    init_db()
+    await init_db()
     get_agent_imports()
+    # Bind the provider client to a connection pool that lives as long as the app.
+    get_http_client()
+    set_default_openai_client(get_client())
+    await trace_writer.start()
     yield
+    await trace_writer.close()
+    await close_http_client()
 
 
 def create_app() -> FastAPI:
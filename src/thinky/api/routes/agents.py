@@ -1,18 +1,52 @@
-import json
-from typing import List
+import logging
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from agents import RunResultStreaming
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 
 from thinky import agent_registry
-from thinky._run import run_agent
+from thinky._response_cache import is_cached_result
+from thinky._run import (
+    DEFAULT_BATCH_CONCURRENCY,
+    run_agent,
+    run_agent_batch,
+    run_agent_streamed,
+)
+from thinky._settings import env_int
 from thinky.api import schemas
 from thinky.api.db.models import AgentRun
-from thinky.api.db.session import get_db
+from thinky.api.db.writer import trace_writer
+from thinky.api.streaming import format_sse, serialize_stream_event
 from thinky.exceptions import AgentRegistrationException
 
+logger = logging.getLogger(__name__)
+
 agent_router = APIRouter(prefix="/agent")
 
+MAX_BATCH_CONCURRENCY = env_int("THINKY_BATCH_MAX_CONCURRENCY", 64)
+
+
+def _build_agent_run(
+    run_id: str,
+    agent_id: str,
+    body: schemas.RunRequest,
+    result: Any,
+    steps: Optional[List[Dict]] = None,
+) -> AgentRun:
+    if steps is None:
+        steps = result.to_input_list()
+
+    return AgentRun(
+        run_id=run_id,
+        agent_id=agent_id,
+        **body.model_dump(),
+        response=result.final_output,
+        steps=steps,
+        cached=is_cached_result(result),
+    )
+
 
 @agent_router.get("/", response_model=List[str])
 async def list_agents():
@@ -22,29 +56,126 @@ async def list_agents():
 
 
 @agent_router.post("/{agent_id}/run", response_model=schemas.RunResponse)
-async def create_agent_run(
-    agent_id: str, body: schemas.RunRequest, db: Session = Depends(get_db)
-):
-    """Run an agent based on agent id."""
+async def create_agent_run(agent_id: str, body: schemas.RunRequest):
+    """Run an agent based on agent id.
+
+    The trace is handed to the background trace writer, so the response is returned
+    before the run is committed to the database.
+    """
 
     try:
         response = await run_agent(input=body.message, agent_id=agent_id)
+        steps = response.to_input_list()
+
+        agent_run_db = _build_agent_run(
+            uuid.uuid4().hex, agent_id, body, response, steps
+        )
+        await trace_writer.submit(agent_run_db)
 
-        agent_run_db = AgentRun(
-            agent_id=agent_id,
+        return schemas.RunResponse(
+            run_id=agent_run_db.run_id,
             **body.model_dump(),
             response=response.final_output,
-            steps=json.dumps(response.to_input_list()),
+            steps=steps,
+            cached=agent_run_db.cached,
         )
+    except AgentRegistrationException as e:
+        raise HTTPException(status_code=404, detail=f"{e}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"{e}")
+
 
-        db.add(agent_run_db)
-        db.commit()
-        db.flush()
-        db.refresh(agent_run_db)
+@agent_router.post("/{agent_id}/runs:batch", response_model=schemas.BatchRunResponse)
+async def create_agent_runs_batch(agent_id: str, body: schemas.BatchRunRequest):
+    """Run an agent over many messages with bounded concurrency.
+
+    Every item gets its own result or error. The traces of all successful runs are
+    written in a single transaction.
+    """
+
+    concurrency = min(
+        body.concurrency or DEFAULT_BATCH_CONCURRENCY, MAX_BATCH_CONCURRENCY
+    )
+    inputs = [item.message for item in body.items]
+    results: List[schemas.BatchRunItem] = []
+    agent_runs: List[AgentRun] = []
+
+    try:
+        async for outcome in run_agent_batch(agent_id, inputs, concurrency):
+            if outcome.error is not None:
+                results.append(
+                    schemas.BatchRunItem(index=outcome.index, error=f"{outcome.error}")
+                )
+                continue
 
-        agent_run_db.steps = json.loads(str(agent_run_db.steps))
-        return agent_run_db
+            result = outcome.result
+            agent_run_db = _build_agent_run(
+                uuid.uuid4().hex, agent_id, body.items[outcome.index], result
+            )
+            agent_runs.append(agent_run_db)
+            results.append(
+                schemas.BatchRunItem(
+                    index=outcome.index,
+                    run_id=agent_run_db.run_id,
+                    response=result.final_output,  # type: ignore
+                    cached=agent_run_db.cached,
+                )
+            )
     except AgentRegistrationException as e:
         raise HTTPException(status_code=404, detail=f"{e}")
+
+    await trace_writer.submit(*agent_runs)
+
+    results.sort(key=lambda item: item.index)
+    return schemas.BatchRunResponse(
+        succeeded=len(agent_runs),
+        failed=len(results) - len(agent_runs),
+        results=results,
+    )
+
+
+async def _stream_agent_run(
+    agent_id: str, body: schemas.RunRequest, result: RunResultStreaming
+) -> AsyncIterator[str]:
+    """Forward the run as server-sent events and persist the trace when it ends."""
+    run_id = uuid.uuid4().hex
+    yield format_sse("run_started", {"run_id": run_id, "agent_id": agent_id})
+
+    try:
+        async for event in result.stream_events():
+            payload = serialize_stream_event(event)
+            if payload is not None:
+                yield format_sse(*payload)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"{e}")
+        logger.error(f"Streamed run of agent '{agent_id}' failed: {e}")
+        yield format_sse("error", {"run_id": run_id, "detail": f"{e}"})
+        return
+    finally:
+        # Stops the background run when the client disconnects early.
+        if not result.is_complete:
+            result.cancel()
+
+    agent_run_db = _build_agent_run(run_id, agent_id, body, result)
+    await trace_writer.submit(agent_run_db)
+
+    yield format_sse("done", {"run_id": run_id, "response": result.final_output})
+
+
+@agent_router.post("/{agent_id}/run/stream")
+async def create_agent_run_stream(agent_id: str, body: schemas.RunRequest):
+    """Run an agent and stream its progress as server-sent events.
+
+    Emits `run_started`, `token`, `tool_call_start`, `tool_call_end`, `handoff`,
+    `agent_updated` and finally `done` (or `error`) events.
+    """
+
+    try:
+        result = run_agent_streamed(input=body.message, agent_id=agent_id)
+    except AgentRegistrationException as e:
+        raise HTTPException(status_code=404, detail=f"{e}")
+
+    return StreamingResponse(
+        _stream_agent_run(agent_id, body, result),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,23 +1,131 @@
-import json
+import base64
+import binascii
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from thinky.api.db.models import AgentRun
-from thinky.api.schemas import TraceResponse
+from thinky.api.db.models import AgentRun, AgentRunStep
+from thinky.api.schemas import TraceListResponse, TraceResponse, TraceSummary
 
 from ..db.session import get_db
 
 trace_router = APIRouter(prefix="/trace")
 
+TRACE_FIELDS = list(TraceSummary.model_fields)
+
+# Steps can be large, list views only load them when asked for explicitly.
+DEFAULT_TRACE_FIELDS = [field for field in TRACE_FIELDS if field != "steps"]
+
+
+def encode_cursor(id: int) -> str:
+    return base64.urlsafe_b64encode(str(id).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Invalid cursor '{cursor}'.")
+
+
+def _parse_fields(fields: Optional[str]) -> List[str]:
+    if not fields:
+        return DEFAULT_TRACE_FIELDS
+
+    selected = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = set(selected) - set(TRACE_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown field(s) {sorted(unknown)}. Choose from: {TRACE_FIELDS}",
+        )
+
+    # The id is always needed to build the next cursor.
+    return ["id"] + [field for field in selected if field != "id"]
+
+
+async def _load_steps(
+    db: AsyncSession, ids: List[int]
+) -> Dict[int, List[Dict[str, Any]]]:
+    """Load the steps of many runs with a single query."""
+    steps: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    rows = await db.scalars(
+        select(AgentRunStep)
+        .where(AgentRunStep.agent_run_id.in_(ids))
+        .order_by(AgentRunStep.agent_run_id, AgentRunStep.position)
+    )
+    for row in rows:
+        steps[row.agent_run_id].append(row.to_item())  # type: ignore
+    return steps
+
+
+@trace_router.get(
+    "/", response_model=TraceListResponse, response_model_exclude_unset=True
+)
+async def list_runs(
+    agent_id: Optional[str] = None,
+    session_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=50, ge=1, le=500),
+    fields: Optional[str] = Query(
+        default=None, description="Comma separated fields to return."
+    ),
+    db: AsyncSession = Depends(get_db),
+):
+    """List traces, newest first, with keyset pagination.
+
+    Pass the `next_cursor` of a page as `cursor` to get the next page. Pages are
+    found with an index seek on `id`, so they stay fast on large tables.
+    """
+    fields_selected = _parse_fields(fields)
+    columns = [field for field in fields_selected if field != "steps"]
+    query = select(*[getattr(AgentRun, column) for column in columns])
+
+    if agent_id is not None:
+        query = query.where(AgentRun.agent_id == agent_id)
+    if session_id is not None:
+        query = query.where(AgentRun.session_id == session_id)
+    if user_id is not None:
+        query = query.where(AgentRun.user_id == user_id)
+    if since is not None:
+        query = query.where(AgentRun.created_at >= since)
+    if until is not None:
+        query = query.where(AgentRun.created_at < until)
+    if cursor is not None:
+        query = query.where(AgentRun.id < decode_cursor(cursor))
+
+    result = await db.execute(query.order_by(AgentRun.id.desc()).limit(limit + 1))
+    rows = result.all()
+
+    page = [dict(zip(columns, row)) for row in rows[:limit]]
+    if "steps" in fields_selected:
+        steps = await _load_steps(db, [item["id"] for item in page])
+        for item in page:
+            item["steps"] = steps.get(item["id"], [])
+
+    items = [TraceSummary(**item) for item in page]
+
+    next_cursor = encode_cursor(rows[limit - 1].id) if len(rows) > limit else None
+    return TraceListResponse(items=items, next_cursor=next_cursor)
+
 
 @trace_router.get("/{id}", response_model=TraceResponse)
-def get_run_by_id(id: str, db: Session = Depends(get_db)):
-    agent_run = db.query(AgentRun).filter(AgentRun.id == id).first()
+async def get_run_by_id(id: str, db: AsyncSession = Depends(get_db)):
+    """Get a trace by its database id or by the `run_id` returned from a run."""
+    condition = AgentRun.id == int(id) if id.isdigit() else AgentRun.run_id == id
+    agent_run = await db.scalar(
+        select(AgentRun).where(condition).options(selectinload(AgentRun.step_rows))
+    )
 
     if not agent_run:
         raise HTTPException(status_code=404, detail=f"Agent run with {id} not found.")
 
-    agent_run.steps = json.loads(str(agent_run.steps))
-
-    return agent_run
+    return TraceResponse.model_validate(agent_run, from_attributes=True)
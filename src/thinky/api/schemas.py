@@ -1,6 +1,7 @@
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class RunRequest(BaseModel):
@@ -22,9 +23,30 @@ class RunRequest(BaseModel):
 
 
 class RunResponse(RunRequest):
-    id: int
+    id: Optional[int] = None
+    run_id: str
     response: str
     steps: List[Dict]
+    cached: bool = False
+
+
+class BatchRunRequest(BaseModel):
+    items: List[RunRequest]
+    concurrency: Optional[int] = Field(default=None, ge=1)
+
+
+class BatchRunItem(BaseModel):
+    index: int
+    run_id: Optional[str] = None
+    response: Optional[str] = None
+    cached: bool = False
+    error: Optional[str] = None
+
+
+class BatchRunResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BatchRunItem]
 
 
 class ToolItemResponse(BaseModel):
@@ -35,9 +57,29 @@ class ToolItemResponse(BaseModel):
 
 class TraceResponse(BaseModel):
     id: int
+    run_id: Optional[str] = None
     agent_id: str
-    session_id: int
-    user_id: int
+    session_id: str
+    user_id: str
     message: str
     response: str
     steps: List[Dict]
+    cached: Optional[bool] = False
+
+
+class TraceSummary(BaseModel):
+    id: int
+    run_id: Optional[str] = None
+    agent_id: Optional[str] = None
+    session_id: Optional[str] = None
+    user_id: Optional[str] = None
+    message: Optional[str] = None
+    response: Optional[str] = None
+    steps: Optional[List[Dict]] = None
+    cached: Optional[bool] = None
+    created_at: Optional[datetime] = None
+
+
+class TraceListResponse(BaseModel):
+    items: List[TraceSummary]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,60 @@
+import json
+from typing import Any, Dict, Optional, Tuple
+
+from agents import StreamEvent
+
+SSEPayload = Tuple[str, Dict[str, Any]]
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Format a server-sent event frame."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def serialize_stream_event(event: StreamEvent) -> Optional[SSEPayload]:
+    """Map an `openai-agents` stream event onto a thinky SSE event.
+
+    Returns:
+        Optional[Tuple[str, Dict[str, Any]]]: The event name and payload, or None for
+        events that are not forwarded to clients.
+    """
+    if event.type == "raw_response_event":
+        if event.data.type == "response.output_text.delta":
+            return "token", {"delta": event.data.delta}
+        return None
+
+    if event.type == "agent_updated_stream_event":
+        return "agent_updated", {"agent": event.new_agent.name}
+
+    item = event.item
+    agent = item.agent.name
+
+    if event.name == "tool_called":
+        raw = item.raw_item
+        return "tool_call_start", {
+            "agent": agent,
+            "name": getattr(raw, "name", None),
+            "call_id": getattr(raw, "call_id", None),
+            "arguments": getattr(raw, "arguments", None),
+        }
+
+    if event.name == "tool_output":
+        raw = item.raw_item
+        call_id = raw.get("call_id") if isinstance(raw, dict) else None
+        return "tool_call_end", {
+            "agent": agent,
+            "call_id": call_id,
+            "output": item.output,
+        }
+
+    if event.name == "handoff_requested":
+        return "handoff", {"status": "requested", "from": agent}
+
+    if event.name == "handoff_occured":
+        return "handoff", {
+            "status": "completed",
+            "from": item.source_agent.name,
+            "to": item.target_agent.name,
+        }
+
+    return None
@@ -1,5 +1,8 @@
+import json
 import logging
-from typing import Annotated, Union
+import sys
+from pathlib import Path
+from typing import Annotated, Any, Dict, List, Optional, Union
 
 import typer
 from rich import print
@@ -9,7 +12,7 @@ from thinky._registry import agent_registry
 from . import __version__
 from ._project_setup import project_init
 from ._registry import get_agent_imports
-from ._run import run_agent
+from ._run import DEFAULT_BATCH_CONCURRENCY, run_agent, run_agent_batch
 from .logging import console, setup_logging
 
 app = typer.Typer(rich_markup_mode="rich")
@@ -77,15 +80,69 @@ def list():
         print("[bold]No Available Agents[/bold]")
 
 
+def _read_batch_inputs(path: Path) -> List[str]:
+    """Read one input per line from a JSONL file.
+
+    Each line is either a JSON string or an object with a `message` or `input` key.
+    """
+    inputs = []
+    with path.open("r") as fp:
+        for line_number, line in enumerate(fp, start=1):
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if isinstance(item, dict):
+                item = item.get("message", item.get("input"))
+            if not isinstance(item, str):
+                raise typer.BadParameter(
+                    f"Line {line_number} of '{path}' has no 'message' or 'input'."
+                )
+            inputs.append(item)
+    return inputs
+
+
+async def _run_batch(agent: str, inputs: List[str], concurrency: int) -> int:
+    """Run a batch and write every result to stdout as a JSON line."""
+    failed = 0
+    async for outcome in run_agent_batch(agent, inputs, concurrency):
+        line: Dict[str, Any] = {"index": outcome.index, "input": outcome.input}
+        if outcome.error is not None:
+            failed += 1
+            line["error"] = f"{outcome.error}"
+        else:
+            line["output"] = outcome.result.final_output  # type: ignore
+        sys.stdout.write(json.dumps(line, default=str) + "\n")
+        sys.stdout.flush()
+    return failed
+
+
 @app.command()
 def run(
     agent: Annotated[str, typer.Argument(help="The name of the agent to run")],
-    input: Annotated[str, typer.Argument(help="The initial input to the agent.")],
+    input: Annotated[
+        Optional[str], typer.Argument(help="The initial input to the agent.")
+    ] = None,
+    batch: Annotated[
+        Optional[Path],
+        typer.Option(
+            help="Run every input of a JSONL file and stream the results as JSONL."
+        ),
+    ] = None,
+    concurrency: Annotated[
+        int, typer.Option(help="Maximum number of concurrent runs in batch mode.")
+    ] = DEFAULT_BATCH_CONCURRENCY,
 ):
     """Run your agent with a given input message."""
 
     import asyncio
 
+    if batch is not None:
+        failed = asyncio.run(_run_batch(agent, _read_batch_inputs(batch), concurrency))
+        raise typer.Exit(code=1 if failed else 0)
+
+    if input is None:
+        raise typer.BadParameter("Provide an input or a --batch file.")
+
     with console.status(f"Agent '{agent}' running..."):
         result = asyncio.run(run_agent(agent, input))
 
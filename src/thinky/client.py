@@ -5,6 +5,8 @@ from typing import Literal, Optional, get_args
 from dotenv import load_dotenv
 from openai import AsyncAzureOpenAI, AsyncOpenAI
 
+from thinky._http import get_http_client
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
@@ -23,7 +25,7 @@ def client_selector(provider: ProviderType) -> AsyncOpenAI:
         raise NotImplementedError("The openai client is not yet implemented.")
 
     if provider == "azure":
-        return AsyncAzureOpenAI()
+        return AsyncAzureOpenAI(http_client=get_http_client())
 
     if provider == "ollama":
         base_url = os.getenv("BASE_URL")
@@ -34,6 +36,7 @@ def client_selector(provider: ProviderType) -> AsyncOpenAI:
         return AsyncOpenAI(
             base_url=base_url,
             api_key="placeholder-ollama-key",
+            http_client=get_http_client(),
         )
 
 
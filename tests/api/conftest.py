@@ -0,0 +1,68 @@
+import asyncio
+import os
+from typing import Any, List
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.pool import NullPool
+
+from thinky.api.db.session import Base, create_db_engine, get_db
+from thinky.api.db.writer import trace_writer
+from thinky.api.main import create_app
+
+
+@pytest.fixture()
+def submitted_runs(monkeypatch) -> List[Any]:
+    """Capture rows handed to the trace writer instead of writing them."""
+    runs: List[Any] = []
+
+    async def submit(*rows: Any) -> None:
+        runs.extend(rows)
+
+    monkeypatch.setattr(trace_writer, "submit", submit)
+    return runs
+
+
+@pytest.fixture(params=["sqlite", "postgres"])
+def database_url(request, tmp_path) -> str:
+    """A local SQLite file, and Postgres when THINKY_TEST_POSTGRES_URL is set."""
+    if request.param == "sqlite":
+        return f"sqlite:///{tmp_path / 'thinky.db'}"
+
+    url = os.environ.get("THINKY_TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("Set THINKY_TEST_POSTGRES_URL to run against Postgres.")
+    return url
+
+
+@pytest.fixture()
+def db_engine(database_url):
+    # Tests run every request on a new event loop, so connections are not pooled.
+    engine = create_db_engine(database_url, poolclass=NullPool)
+
+    async def reset() -> None:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.drop_all)
+            await connection.run_sync(Base.metadata.create_all)
+
+    asyncio.run(reset())
+    yield engine
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture()
+def session_factory(db_engine) -> async_sessionmaker:
+    return async_sessionmaker(bind=db_engine, expire_on_commit=False)
+
+
+@pytest.fixture()
+def client(session_factory) -> TestClient:
+    app = create_app()
+
+    async def get_test_db():
+        async with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = get_test_db
+    return TestClient(app)
@@ -0,0 +1,83 @@
+import json
+
+from thinky._response_cache import InMemoryBackend, ResponseCache, set_response_cache
+
+RUN_REQUEST = {"message": "Hi", "user_id": "1", "session_id": "1"}
+
+
+def parse_sse(text: str):
+    events = []
+    for frame in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in frame.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_run_agent(client, fake_agent, submitted_runs):
+    response = client.post("/v1/agent/fake_agent/run", json=RUN_REQUEST)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["response"] == "Hello from fake"
+    assert [run.run_id for run in submitted_runs] == [body["run_id"]]
+
+
+def test_run_agent_not_registered(client):
+    response = client.post("/v1/agent/unknown/run", json=RUN_REQUEST)
+    assert response.status_code == 404
+
+
+def test_run_agent_stream(client, fake_agent, submitted_runs):
+    response = client.post("/v1/agent/fake_agent/run/stream", json=RUN_REQUEST)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = parse_sse(response.text)
+    names = [name for name, _ in events]
+    assert names[0] == "run_started"
+    assert names[-1] == "done"
+
+    deltas = "".join(data["delta"] for name, data in events if name == "token")
+    assert deltas == "Hello from fake"
+
+    done = events[-1][1]
+    assert done["response"] == "Hello from fake"
+    assert [run.run_id for run in submitted_runs] == [done["run_id"]]
+
+
+def test_run_agent_stream_not_registered(client):
+    response = client.post("/v1/agent/unknown/run/stream", json=RUN_REQUEST)
+    assert response.status_code == 404
+
+
+def test_run_agent_batch(client, fake_agent, submitted_runs):
+    items = [dict(RUN_REQUEST, message=f"Hi {i}") for i in range(5)]
+    response = client.post(
+        "/v1/agent/fake_agent/runs:batch", json={"items": items, "concurrency": 2}
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["succeeded"] == 5
+    assert body["failed"] == 0
+    assert [item["index"] for item in body["results"]] == list(range(5))
+    assert len(submitted_runs) == 5
+
+
+def test_run_agent_batch_not_registered(client):
+    response = client.post("/v1/agent/unknown/runs:batch", json={"items": []})
+    assert response.status_code == 404
+
+
+def test_run_agent_cached_trace(client, fake_agent, submitted_runs):
+    set_response_cache(ResponseCache(InMemoryBackend()))
+    try:
+        first = client.post("/v1/agent/fake_agent/run", json=RUN_REQUEST).json()
+        second = client.post("/v1/agent/fake_agent/run", json=RUN_REQUEST).json()
+    finally:
+        set_response_cache(None)
+
+    assert not first["cached"]
+    assert second["cached"]
+    assert [run.cached for run in submitted_runs] == [False, True]
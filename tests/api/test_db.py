@@ -0,0 +1,83 @@
+import asyncio
+import json
+import sqlite3
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, selectinload
+
+from thinky.api.db import compression
+from thinky.api.db.migrations import migrate_legacy_steps
+from thinky.api.db.models import AgentRun, AgentRunStep
+from thinky.api.db.session import Base, _add_missing_columns
+
+
+def test_steps_are_stored_as_rows_and_compressed(session_factory):
+    steps = [
+        {"role": "user", "content": "hi"},
+        {"type": "function_call", "name": "get_forecast", "call_id": "c1"},
+        {"type": "function_call_output", "call_id": "c1", "output": "x" * 5000},
+    ]
+
+    async def main() -> None:
+        async with session_factory() as db:
+            db.add(AgentRun(run_id="r", agent_id="a", steps=steps))
+            await db.commit()
+
+        async with session_factory() as db:
+            rows = (
+                await db.scalars(select(AgentRunStep).order_by(AgentRunStep.position))
+            ).all()
+            assert [row.type for row in rows] == [
+                "message",
+                "function_call",
+                "function_call_output",
+            ]
+            assert rows[1].name == "get_forecast"
+            assert rows[0].encoding == "raw"
+            assert rows[2].encoding in ("zlib", "zstd")
+            assert len(rows[2].payload) < rows[2].size
+
+            run = await db.scalar(
+                select(AgentRun).options(selectinload(AgentRun.step_rows))
+            )
+            assert run.steps == steps
+
+    asyncio.run(main())
+
+
+def test_decompress_round_trip():
+    data = b"thinky" * 1000
+    payload, encoding = compression.compress(data)
+    assert compression.decompress(payload, encoding) == data
+
+
+def test_migrate_legacy_steps(tmp_path):
+    path = tmp_path / "thinky.db"
+    legacy_steps = [{"role": "user", "content": "hi"}]
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE agent_runs (id INTEGER PRIMARY KEY, agent_id VARCHAR, "
+        "session_id VARCHAR, user_id VARCHAR, message VARCHAR, response VARCHAR, "
+        "steps VARCHAR)"
+    )
+    connection.execute(
+        "INSERT INTO agent_runs VALUES (1, 'a', 's', 'u', 'hi', 'hello', ?)",
+        (json.dumps(legacy_steps),),
+    )
+    connection.commit()
+    connection.close()
+
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.connect() as connection:
+        Base.metadata.create_all(bind=connection)
+        _add_missing_columns(connection)
+        connection.commit()
+
+        assert migrate_legacy_steps(connection) == 1
+        assert migrate_legacy_steps(connection) == 0
+
+    with Session(bind=engine) as db:
+        run = db.query(AgentRun).one()
+        assert run.steps == legacy_steps
+        assert run.legacy_steps is None
+        assert run.run_id is not None
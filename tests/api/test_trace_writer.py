@@ -0,0 +1,58 @@
+import asyncio
+
+from sqlalchemy import func, select
+
+from thinky.api.db.models import AgentRun
+from thinky.api.db.writer import TraceWriter
+
+
+async def count_runs(session_factory) -> int:
+    async with session_factory() as db:
+        return await db.scalar(select(func.count()).select_from(AgentRun))
+
+
+def make_run(i: int) -> AgentRun:
+    return AgentRun(run_id=f"run-{i}", agent_id="dummy", message=f"{i}", steps=[])
+
+
+def test_trace_writer_drains_on_close(session_factory):
+    writer = TraceWriter(session_factory, max_batch_size=10, flush_interval=60)
+
+    async def main():
+        await writer.start()
+        for i in range(25):
+            await writer.submit(make_run(i))
+        await writer.close()
+        assert await count_runs(session_factory) == 25
+
+    asyncio.run(main())
+
+    assert writer.rows_written == 25
+    assert writer.batches_written == 3
+
+
+def test_trace_writer_flushes_after_interval(session_factory):
+    writer = TraceWriter(session_factory, max_batch_size=100, flush_interval=0.01)
+
+    async def main():
+        await writer.submit(make_run(1))
+        await writer.flush()
+        assert await count_runs(session_factory) == 1
+        await writer.close()
+
+    asyncio.run(main())
+
+
+def test_trace_writer_isolates_failed_submission(session_factory):
+    writer = TraceWriter(session_factory, max_batch_size=10, flush_interval=60)
+
+    async def main():
+        await writer.submit(make_run(1))
+        await writer.submit(make_run(1))
+        await writer.submit(make_run(2))
+        await writer.close()
+
+    asyncio.run(main())
+
+    assert writer.rows_written == 2
+    assert writer.rows_failed == 1
@@ -0,0 +1,74 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from thinky.api.db.models import AgentRun
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture()
+def runs(session_factory):
+    async def seed() -> None:
+        async with session_factory() as db:
+            for i in range(7):
+                db.add(
+                    AgentRun(
+                        run_id=f"run-{i}",
+                        agent_id="even" if i % 2 == 0 else "odd",
+                        session_id="s",
+                        user_id="u",
+                        message=f"message {i}",
+                        response=f"response {i}",
+                        steps=[{"role": "user", "content": "hi"}],
+                        created_at=START + timedelta(hours=i),
+                    )
+                )
+            await db.commit()
+
+    asyncio.run(seed())
+
+
+def test_list_traces_paginates_newest_first(client, runs):
+    page = client.get("/v1/trace/", params={"limit": 3}).json()
+    assert [item["run_id"] for item in page["items"]] == ["run-6", "run-5", "run-4"]
+
+    seen = [item["id"] for item in page["items"]]
+    while page["next_cursor"]:
+        page = client.get(
+            "/v1/trace/", params={"limit": 3, "cursor": page["next_cursor"]}
+        ).json()
+        seen += [item["id"] for item in page["items"]]
+
+    assert seen == sorted(seen, reverse=True)
+    assert len(seen) == 7
+
+
+def test_list_traces_filters(client, runs):
+    page = client.get("/v1/trace/", params={"agent_id": "odd"}).json()
+    assert [item["run_id"] for item in page["items"]] == ["run-5", "run-3", "run-1"]
+
+    since = (START + timedelta(hours=2)).isoformat()
+    until = (START + timedelta(hours=4)).isoformat()
+    page = client.get("/v1/trace/", params={"since": since, "until": until}).json()
+    assert [item["run_id"] for item in page["items"]] == ["run-3", "run-2"]
+
+
+def test_list_traces_projection(client, runs):
+    page = client.get("/v1/trace/", params={"limit": 1}).json()
+    assert "steps" not in page["items"][0]
+
+    page = client.get("/v1/trace/", params={"limit": 1, "fields": "steps"}).json()
+    assert page["items"][0] == {"id": 7, "steps": [{"role": "user", "content": "hi"}]}
+
+
+def test_list_traces_rejects_unknown_fields_and_cursors(client, runs):
+    assert client.get("/v1/trace/", params={"fields": "secret"}).status_code == 400
+    assert client.get("/v1/trace/", params={"cursor": "!!"}).status_code == 400
+
+
+def test_get_trace_by_run_id(client, runs):
+    response = client.get("/v1/trace/run-3")
+    assert response.status_code == 200
+    assert response.json()["message"] == "message 3"
@@ -1,7 +1,81 @@
+from typing import Any, AsyncIterator
+
 import pytest
+from agents import Agent, Model, ModelResponse, Usage
 from dotenv import load_dotenv
+from openai.types.responses import (
+    Response,
+    ResponseCompletedEvent,
+    ResponseOutputMessage,
+    ResponseOutputText,
+    ResponseTextDeltaEvent,
+)
+
+from thinky import agent_registry, register_agent
 
 
 @pytest.fixture(autouse=True)
 def load_env():
     load_dotenv()
+
+
+def _message(text: str) -> ResponseOutputMessage:
+    return ResponseOutputMessage(
+        id="msg_fake",
+        content=[ResponseOutputText(text=text, type="output_text", annotations=[])],
+        role="assistant",
+        status="completed",
+        type="message",
+    )
+
+
+class FakeModel(Model):
+    """Model that answers every request with the same text, without network access."""
+
+    def __init__(self, reply: str = "Hello from fake") -> None:
+        self.reply = reply
+        self.calls = 0
+
+    async def get_response(self, *args: Any, **kwargs: Any) -> ModelResponse:
+        self.calls += 1
+        return ModelResponse(
+            output=[_message(self.reply)],
+            usage=Usage(requests=1, input_tokens=3, output_tokens=2, total_tokens=5),
+            response_id=None,
+        )
+
+    async def stream_response(self, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        self.calls += 1
+        for i, word in enumerate(self.reply.split(" ")):
+            yield ResponseTextDeltaEvent(
+                content_index=0,
+                delta=word if i == 0 else f" {word}",
+                item_id="msg_fake",
+                output_index=0,
+                sequence_number=i,
+                type="response.output_text.delta",
+            )
+        yield ResponseCompletedEvent(
+            response=Response.model_construct(
+                id="resp_fake", output=[_message(self.reply)], usage=None
+            ),
+            sequence_number=i + 1,
+            type="response.completed",
+        )
+
+
+@pytest.fixture()
+def fake_model() -> FakeModel:
+    return FakeModel()
+
+
+@pytest.fixture()
+def fake_agent(fake_model):
+    agent_registry.pop("fake_agent", None)
+
+    @register_agent
+    def fake_agent() -> Agent:
+        return Agent(name="fake_agent", instructions="Be fake.", model=fake_model)
+
+    yield fake_agent
+    agent_registry.pop("fake_agent", None)
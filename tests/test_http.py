@@ -0,0 +1,25 @@
+import asyncio
+
+from thinky._http import close_http_client, create_http_client, get_http_client
+
+
+def test_get_http_client_is_shared():
+    assert get_http_client() is get_http_client()
+
+
+def test_close_http_client_recreates_client():
+    client = get_http_client()
+    asyncio.run(close_http_client())
+
+    assert client.is_closed
+    assert get_http_client() is not client
+
+
+def test_create_http_client_limits_from_env(monkeypatch):
+    monkeypatch.setenv("THINKY_HTTP_MAX_CONNECTIONS", "7")
+    monkeypatch.setenv("THINKY_HTTP_KEEPALIVE_EXPIRY", "3")
+    client = create_http_client()
+
+    pool = client._transport._pool
+    assert pool._max_connections == 7
+    assert pool._keepalive_expiry == 3.0
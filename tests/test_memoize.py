@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+from agents import function_tool
+
+from thinky import memoize_tool
+
+
+def test_memoize_tool_caches_by_arguments():
+    calls = []
+
+    @memoize_tool(ttl=60)
+    async def lookup(city: str, days: int = 1) -> str:
+        calls.append((city, days))
+        return f"{city}:{days}"
+
+    async def main():
+        assert await lookup("Utrecht") == "Utrecht:1"
+        assert await lookup(city="Utrecht", days=1) == "Utrecht:1"
+        assert await lookup("Utrecht", 2) == "Utrecht:2"
+
+    asyncio.run(main())
+
+    assert calls == [("Utrecht", 1), ("Utrecht", 2)]
+    stats = lookup.cache_info()
+    assert (stats.hits, stats.misses) == (1, 2)
+
+
+def test_memoize_tool_coalesces_concurrent_calls():
+    calls = []
+
+    @memoize_tool
+    async def slow(x: int) -> int:
+        calls.append(x)
+        await asyncio.sleep(0.01)
+        return x * 2
+
+    async def main():
+        return await asyncio.gather(*(slow(3) for _ in range(5)))
+
+    assert asyncio.run(main()) == [6] * 5
+    assert calls == [3]
+    assert slow.cache_info().coalesced == 4
+
+
+def test_memoize_tool_does_not_cache_exceptions():
+    calls = []
+
+    @memoize_tool
+    async def flaky(x: int) -> int:
+        calls.append(x)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        return x
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(flaky(1))
+    assert asyncio.run(flaky(1)) == 1
+
+
+def test_memoize_tool_keeps_function_tool_schema():
+    async def forecast(latitude: float, longitude: float) -> str:
+        """Get weather forecast for a location.
+
+        Args:
+            latitude: Latitude of the location
+            longitude: Longitude of the location
+        """
+        return ""
+
+    plain = function_tool(forecast)
+    memoized = function_tool(memoize_tool(forecast))
+
+    assert memoized.name == plain.name
+    assert memoized.description == plain.description
+    assert memoized.params_json_schema == plain.params_json_schema
+
+
+def test_memoize_tool_rejects_sync_functions():
+    with pytest.raises(TypeError, match="only supports async"):
+
+        @memoize_tool
+        def sync(x: int) -> int:
+            return x
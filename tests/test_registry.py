@@ -5,7 +5,13 @@ from pathlib import Path
 import pytest
 from agents import Agent
 
-from thinky import agent_registry, register_agent
+from thinky import (
+    agent_cache_stats,
+    agent_registry,
+    invalidate_agent,
+    register_agent,
+)
+from thinky._cache import TTLCache
 from thinky._registry import (
     _get_module_data_from_path,
     get_agent,
@@ -96,3 +102,63 @@ def test_get_agent_path_env_missing():
         del os.environ["AGENT_DIR_PATH"]
     with pytest.raises(RuntimeError, match="Missing required environment variable"):
         get_agent_path()
+
+
+def test_get_agent_rebuilds_by_default(clear_resistry):
+    @register_agent
+    def fresh() -> Agent:
+        return DummyAgent()
+
+    assert get_agent("fresh") is not get_agent("fresh")
+
+
+def test_get_agent_reuse_caches_instance(clear_resistry):
+    calls = []
+
+    @register_agent(reuse=True)
+    def reused() -> Agent:
+        calls.append(1)
+        return DummyAgent()
+
+    before = agent_cache_stats()
+    first = get_agent("reused")
+    second = get_agent("reused")
+    after = agent_cache_stats()
+
+    assert first is second
+    assert len(calls) == 1
+    assert after.misses - before.misses == 1
+    assert after.hits - before.hits == 1
+
+
+def test_invalidate_agent_rebuilds_instance(clear_resistry):
+    @register_agent(reuse=True)
+    def invalidated() -> Agent:
+        return DummyAgent()
+
+    first = get_agent("invalidated")
+    invalidate_agent("invalidated")
+
+    assert get_agent("invalidated") is not first
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert cache.stats().evictions == 1
+
+
+def test_ttl_cache_expires_entries():
+    now = [0.0]
+    cache = TTLCache(maxsize=2, ttl=10, clock=lambda: now[0])
+    cache.set("a", 1)
+    now[0] = 10.0
+
+    assert cache.get("a") is None
+    assert cache.stats().misses == 1
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+from agents import Agent
+
+from thinky import agent_registry, register_agent
+from thinky._response_cache import (
+    InMemoryBackend,
+    ResponseCache,
+    SQLiteBackend,
+    response_cache_key,
+    set_response_cache,
+)
+from thinky._run import run_agent
+
+
+@pytest.fixture()
+def memory_cache():
+    cache = ResponseCache(InMemoryBackend(maxsize=8, ttl=60))
+    set_response_cache(cache)
+    yield cache
+    set_response_cache(None)
+
+
+def test_response_cache_key_normalizes_whitespace():
+    agent = Agent(name="a", instructions="Be brief.", model="m")
+
+    assert response_cache_key("a", agent, "Hi  there ") == response_cache_key(
+        "a", agent, "Hi there"
+    )
+    assert response_cache_key("a", agent, "Hi") != response_cache_key("b", agent, "Hi")
+
+
+def test_response_cache_key_changes_with_instructions():
+    first = Agent(name="a", instructions="Be brief.", model="m")
+    second = Agent(name="a", instructions="Be verbose.", model="m")
+
+    assert response_cache_key("a", first, "Hi") != response_cache_key("a", second, "Hi")
+
+
+def test_response_cache_key_skips_dynamic_instructions():
+    agent = Agent(name="a", instructions=lambda ctx, agent: "Be brief.", model="m")
+    assert response_cache_key("a", agent, "Hi") is None
+
+
+def test_run_agent_serves_cached_response(memory_cache, fake_agent, fake_model):
+    first = asyncio.run(run_agent("fake_agent", "Hi"))
+    second = asyncio.run(run_agent("fake_agent", "Hi"))
+
+    assert fake_model.calls == 1
+    assert not getattr(first, "cached", False)
+    assert second.cached
+    assert second.final_output == first.final_output
+    assert second.to_input_list() == first.to_input_list()
+    assert memory_cache.stats().hits == 1
+
+
+def test_run_agent_respects_opt_out(memory_cache, fake_model):
+    agent_registry.pop("uncached_agent", None)
+
+    @register_agent(response_cache=False)
+    def uncached_agent() -> Agent:
+        return Agent(name="uncached_agent", model=fake_model)
+
+    asyncio.run(run_agent("uncached_agent", "Hi"))
+    asyncio.run(run_agent("uncached_agent", "Hi"))
+
+    assert fake_model.calls == 2
+    agent_registry.pop("uncached_agent", None)
+
+
+def test_sqlite_backend_evicts_least_recently_used(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "cache.db"), maxsize=2, ttl=60)
+    backend.set("a", {"final_output": "A", "steps": []})
+    backend.set("b", {"final_output": "B", "steps": []})
+    backend.get("a")
+    backend.set("c", {"final_output": "C", "steps": []})
+
+    assert backend.get("a") == {"final_output": "A", "steps": []}
+    assert backend.get("b") is None
+    assert backend.stats().evictions == 1
+
+
+def test_sqlite_backend_expires_entries(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "cache.db"), maxsize=2, ttl=0)
+    backend.set("a", {"final_output": "A", "steps": []})
+
+    assert backend.get("a") is None
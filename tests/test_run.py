@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+
+from thinky import _run
+from thinky._run import run_agent_batch
+from thinky.exceptions import AgentRegistrationException
+
+
+def test_run_agent_batch_bounds_concurrency(monkeypatch):
+    in_flight = []
+    peak = []
+
+    async def fake_run_agent(agent_id, input):
+        in_flight.append(input)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(input)
+        if input == "bad":
+            raise RuntimeError("boom")
+        return input.upper()
+
+    monkeypatch.setattr(_run, "run_agent", fake_run_agent)
+    monkeypatch.setattr(_run, "ensure_registered", lambda agent_id: None)
+
+    async def collect():
+        inputs = ["a", "b", "bad", "c", "d", "e"]
+        return [item async for item in run_agent_batch("dummy", inputs, 2)]
+
+    results = asyncio.run(collect())
+
+    assert max(peak) == 2
+    assert sorted(item.index for item in results) == list(range(6))
+    errors = [item for item in results if item.error is not None]
+    assert [item.input for item in errors] == ["bad"]
+
+
+def test_run_agent_batch_unknown_agent():
+    async def collect():
+        return [item async for item in run_agent_batch("unknown_agent", ["a"])]
+
+    with pytest.raises(AgentRegistrationException):
+        asyncio.run(collect())